@@ -1,7 +1,9 @@
 import gradio as gr
 import os
+import sys
 import json
 import time
+import datetime
 from typing import List, Dict, Optional, Tuple
 import logging
 
@@ -123,8 +125,6 @@ def set_research_goal(
 
 def run_cycle() -> Tuple[str, str, str]:
     """Run a single research cycle with detailed step logging for debugging."""
-    import datetime
-
     global current_research_goal, global_context, supervisor
 
     if not current_research_goal:
@@ -294,7 +294,6 @@ def format_cycle_results(cycle_details: Dict, log_file: str = None) -> str:
                     
         elif step_name == 'meta_review':
             # Debug: log the actual meta_review data structure
-            import sys
             print("DEBUG: meta_review step_data =", step_data, file=sys.stderr)
             assert isinstance(step_data, dict), "meta_review step_data is not a dict"
             # Accept both direct dict or nested under 'meta_review'
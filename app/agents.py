@@ -9,11 +9,15 @@ from .utils import (
     logger, # Use the logger configured in utils
     call_llm,
     generate_unique_id,
-    similarity_score,
+    similarity_matrix,
     generate_visjs_data
 )
 from .config import config
 
+# Review levels accepted from the LLM, and their debate scores
+_REVIEW_LEVELS = frozenset({"HIGH", "MEDIUM", "LOW"})
+_REVIEW_SCORES = {"HIGH": 3, "MEDIUM": 2, "LOW": 1, None: 0, "ERROR": 0} # Handle ERROR case
+
 # --- Agent-Specific LLM Calls (Moved from main.py/utils.py for better cohesion) ---
 
 # Updated signature to accept temperature
@@ -94,13 +98,13 @@ def call_llm_for_reflection(hypothesis_text: str, temperature: float = 0.5) -> D
 
         # Update defaults with parsed data, performing basic validation
         novelty = parsed_data.get("novelty_review", "MEDIUM").upper()
-        if novelty in ["HIGH", "MEDIUM", "LOW"]:
+        if novelty in _REVIEW_LEVELS:
             review_data["novelty_review"] = novelty
         else:
             logger.warning("Invalid novelty review value received: %s", novelty)
 
         feasibility = parsed_data.get("feasibility_review", "MEDIUM").upper()
-        if feasibility in ["HIGH", "MEDIUM", "LOW"]:
+        if feasibility in _REVIEW_LEVELS:
             review_data["feasibility_review"] = feasibility
         else:
             logger.warning("Invalid feasibility review value received: %s", feasibility)
@@ -125,9 +129,8 @@ def call_llm_for_reflection(hypothesis_text: str, temperature: float = 0.5) -> D
 def run_pairwise_debate(hypoA: Hypothesis, hypoB: Hypothesis) -> Hypothesis:
     """Compares two hypotheses based on novelty and feasibility scores."""
     def score(h: Hypothesis) -> int:
-        mapping = {"HIGH": 3, "MEDIUM": 2, "LOW": 1, None: 0, "ERROR": 0} # Handle ERROR case
-        score_novelty = mapping.get(h.novelty_review, 0) if isinstance(h.novelty_review, str) else 0
-        score_feasibility = mapping.get(h.feasibility_review, 0) if isinstance(h.feasibility_review, str) else 0
+        score_novelty = _REVIEW_SCORES.get(h.novelty_review, 0) if isinstance(h.novelty_review, str) else 0
+        score_feasibility = _REVIEW_SCORES.get(h.feasibility_review, 0) if isinstance(h.feasibility_review, str) else 0
         return score_novelty + score_feasibility
 
     scoreA = score(hypoA)
@@ -198,9 +201,6 @@ class GenerationAgent:
                 continue # Skip this one, maybe add placeholder?
 
             hypo_id = generate_unique_id("G")
-            # Ensure ID is unique within the current context
-            while hypo_id in context.hypotheses:
-                hypo_id = generate_unique_id("G")
             h = Hypothesis(hypo_id, idea["title"], idea["text"])
             logger.info("Generated hypothesis: %s", h.to_dict())
             new_hypos.append(h)
@@ -258,6 +258,9 @@ class RankingAgent:
             loser = hB if winner == hA else hA
             # Pass the specific k_factor
             update_elo(winner, loser, k_factor=k_factor)
+            # Keep the context's vectorized Elo index in sync
+            context.update_elo(winner.hypothesis_id, winner.elo_score)
+            context.update_elo(loser.hypothesis_id, loser.elo_score)
             # Record result in context (consider if this needs iteration info)
             context.tournament_results.append({
                 "iteration": context.iteration_number, # Add iteration number
@@ -277,8 +280,7 @@ class EvolutionAgent:
             logger.info("Not enough active hypotheses to perform evolution.")
             return []
 
-        sorted_by_elo = sorted(active, key=lambda h: h.elo_score, reverse=True)
-        top_candidates = sorted_by_elo[:top_k]
+        top_candidates = context.top_k_by_elo(top_k)
 
         new_hypotheses = []
         # Combine the top two for now, could be extended
@@ -303,6 +305,9 @@ class ProximityAgent:
             logger.info("No active hypotheses to build proximity graph.")
             return {"adjacency_graph": {}, "nodes": [], "edges": []}
 
+        # Score every pair in one batched encode instead of one encode per pair
+        similarities = similarity_matrix([h.text for h in active_hypotheses])
+
         for i in range(len(active_hypotheses)):
             hypo_i = active_hypotheses[i]
             adjacency[hypo_i.hypothesis_id] = []
@@ -311,7 +316,7 @@ class ProximityAgent:
                     continue
                 hypo_j = active_hypotheses[j]
                 if hypo_i.text and hypo_j.text:
-                    sim = similarity_score(hypo_i.text, hypo_j.text)
+                    sim = float(similarities[i, j])
                     adjacency[hypo_i.hypothesis_id].append({
                         "other_id": hypo_j.hypothesis_id,
                         "similarity": sim
@@ -343,7 +348,7 @@ class MetaReviewAgent:
                 comment_summary.add("Some ideas may have low feasibility.")
             # Could add critiques based on adjacency graph (e.g., clusters, outliers)
 
-        best_hypotheses = sorted(active_hypotheses, key=lambda h: h.elo_score, reverse=True)[:3]
+        best_hypotheses = context.top_k_by_elo(3)
         logger.info("Top hypotheses for meta-review: %s", [h.hypothesis_id for h in best_hypotheses])
 
         # Example suggested next steps
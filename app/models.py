@@ -1,5 +1,7 @@
 import logging
+import operator
 from typing import List, Dict, Optional
+import numpy as np
 from pydantic import BaseModel
 
 # Assuming logger is configured elsewhere or passed in if needed within methods
@@ -13,6 +15,13 @@ from pydantic import BaseModel
 ###############################################################################
 
 class Hypothesis:
+    __slots__ = ("hypothesis_id", "title", "text", "novelty_review",
+                 "feasibility_review", "elo_score", "review_comments",
+                 "references", "is_active", "parent_ids")
+    # to_dict keys, in the same order as __slots__ (hypothesis_id is exported as "id")
+    _dict_keys = ("id",) + __slots__[1:]
+    _getter = operator.attrgetter(*__slots__)
+
     def __init__(self, hypothesis_id: str, title: str, text: str):
         self.hypothesis_id = hypothesis_id
         self.title = title
@@ -26,23 +35,16 @@ class Hypothesis:
         self.parent_ids: List[str] = []  # Store IDs of parent hypotheses
 
     def to_dict(self) -> dict:
-        return {
-            "id": self.hypothesis_id,
-            "title": self.title,
-            "text": self.text,
-            "novelty_review": self.novelty_review,
-            "feasibility_review": self.feasibility_review,
-            "elo_score": self.elo_score,
-            "review_comments": self.review_comments,
-            "references": self.references,
-            "is_active": self.is_active,
-            "parent_ids": self.parent_ids,  # Include parent IDs
-        }
+        return dict(zip(self._dict_keys, self._getter(self)))
 
 # Import config to access defaults easily
 from .config import config
 
 class ResearchGoal:
+    __slots__ = ("description", "constraints", "llm_model", "num_hypotheses",
+                 "generation_temperature", "reflection_temperature",
+                 "elo_k_factor", "top_k_hypotheses")
+
     def __init__(self,
                  description: str,
                  constraints: Optional[Dict] = None,
@@ -66,20 +68,80 @@ class ResearchGoal:
 class ContextMemory:
     """
     A simple in-memory context storage.
+
+    Alongside the ``hypotheses`` dict, a struct-of-arrays index (``elo``,
+    ``active``, ``id_to_row``) is kept so that leaderboard and active-filter
+    scans run as vectorized numpy ops instead of per-object attribute reads.
+    Elo and activity changes should go through ``update_elo`` / ``set_active``
+    so both views stay in sync.
     """
+    _INITIAL_CAPACITY = 64
+
     def __init__(self):
         self.hypotheses: Dict[str, Hypothesis] = {}  # key: hypothesis_id
         self.tournament_results: List[Dict] = []
         self.meta_review_feedback: List[Dict] = []
         self.iteration_number: int = 0
+        # SoA index over self.hypotheses (row i <-> self._id_list[i])
+        self._id_list: List[str] = []
+        self.id_to_row: Dict[str, int] = {}
+        self.elo = np.empty(self._INITIAL_CAPACITY, dtype=np.float64)
+        self.active = np.empty(self._INITIAL_CAPACITY, dtype=bool)
+
+    def _grow(self):
+        """Doubles the capacity of the SoA arrays."""
+        n = len(self._id_list)
+        capacity = 2 * len(self.elo)
+        elo = np.empty(capacity, dtype=np.float64)
+        active = np.empty(capacity, dtype=bool)
+        elo[:n] = self.elo[:n]
+        active[:n] = self.active[:n]
+        self.elo, self.active = elo, active
 
     def add_hypothesis(self, hypothesis: Hypothesis):
-        self.hypotheses[hypothesis.hypothesis_id] = hypothesis
+        hypothesis_id = hypothesis.hypothesis_id
+        self.hypotheses[hypothesis_id] = hypothesis
+        row = self.id_to_row.get(hypothesis_id)
+        if row is None:
+            row = len(self._id_list)
+            if row == len(self.elo):
+                self._grow()
+            self._id_list.append(hypothesis_id)
+            self.id_to_row[hypothesis_id] = row
+        self.elo[row] = hypothesis.elo_score
+        self.active[row] = hypothesis.is_active
         # Consider moving logging out of the model if possible
         # logger.info(f"Added hypothesis {hypothesis.hypothesis_id}")
 
+    def update_elo(self, hypothesis_id: str, elo_score: float):
+        """Sets a hypothesis' Elo score on both the object and the SoA index."""
+        row = self.id_to_row.get(hypothesis_id)
+        if row is None:
+            return
+        self.hypotheses[hypothesis_id].elo_score = elo_score
+        self.elo[row] = elo_score
+
+    def set_active(self, hypothesis_id: str, is_active: bool):
+        """Sets a hypothesis' active flag on both the object and the SoA index."""
+        row = self.id_to_row.get(hypothesis_id)
+        if row is None:
+            return
+        self.hypotheses[hypothesis_id].is_active = is_active
+        self.active[row] = is_active
+
     def get_active_hypotheses(self) -> List[Hypothesis]:
-        return [h for h in self.hypotheses.values() if h.is_active]
+        n = len(self._id_list)
+        return [self.hypotheses[self._id_list[i]] for i in np.flatnonzero(self.active[:n])]
+
+    def top_k_by_elo(self, k: int, active_only: bool = True) -> List[Hypothesis]:
+        """Returns up to k hypotheses with the highest Elo score, best first."""
+        n = len(self._id_list)
+        if k <= 0 or n == 0:
+            return []
+        rows = np.flatnonzero(self.active[:n]) if active_only else np.arange(n)
+        # Stable sort keeps insertion order among tied scores, matching sorted(..., reverse=True)
+        top_rows = rows[np.argsort(-self.elo[rows], kind="stable")[:k]]
+        return [self.hypotheses[self._id_list[row]] for row in top_rows]
 
 
 ###############################################################################
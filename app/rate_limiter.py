@@ -0,0 +1,56 @@
+import time
+import threading
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket refilled continuously at ``rate_per_min``.
+
+    Used to throttle LLM calls up front (requests-per-minute and
+    tokens-per-minute) instead of waiting for the provider to return 429s.
+    """
+
+    def __init__(self, rate_per_min: float, capacity: Optional[float] = None):
+        if rate_per_min <= 0:
+            raise ValueError("rate_per_min must be positive")
+        self.rate_per_sec = rate_per_min / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_min)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """Adds tokens accrued since the last refill. Caller must hold the lock."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate_per_sec)
+        self._last = now
+
+    def acquire(self, amount: float = 1.0):
+        """Blocks until ``amount`` tokens are available, then consumes them."""
+        # A request larger than the bucket could never be satisfied; cap it.
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait_time = (amount - self._tokens) / self.rate_per_sec
+            time.sleep(wait_time)
+
+    def reconcile(self, delta: float):
+        """
+        Corrects for actual vs. estimated usage after a call.
+
+        A positive ``delta`` (more used than estimated) puts the bucket into
+        debt so later callers wait; a negative one returns unused tokens.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - delta)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token) used before a call is made."""
+    return len(text) // 4 + 1
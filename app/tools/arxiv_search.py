@@ -1,9 +1,9 @@
 import arxiv
 import logging
+import time
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from dateutil import parser
-import re
 
 logger = logging.getLogger(__name__)
 
@@ -52,7 +52,6 @@ class ArxivSearchTool:
             logger.debug(f"Expanded search query: '{search_query}'")
             
         try:
-            import time
             start_time = time.time()
             
             search = arxiv.Search(
@@ -129,7 +128,6 @@ class ArxivSearchTool:
         """Get detailed information for a specific paper by arXiv ID"""
         logger.info(f"Fetching arXiv paper details for ID: {arxiv_id}")
         try:
-            import time
             start_time = time.time()
             
             search = arxiv.Search(id_list=[arxiv_id])
@@ -190,9 +188,8 @@ class ArxivSearchTool:
         """Clean text by removing extra whitespace and newlines"""
         if not text:
             return ""
-        # Replace multiple whitespace with single space
-        cleaned = re.sub(r'\s+', ' ', text)
-        return cleaned.strip()
+        # Collapse whitespace runs and trim in a single pass
+        return " ".join(text.split())
     
     def analyze_research_trends(self, query: str, days_back: int = 30) -> Dict:
         """Analyze research trends for a given topic"""
@@ -1,17 +1,26 @@
 import logging
-import time
 import os
-import random
 import json
+import itertools
+import uuid
 from typing import List, Dict
 import openai
 from openai import OpenAI
+from tenacity import (
+    retry,
+    stop_after_attempt,
+    wait_random_exponential,
+    retry_if_exception_type,
+    before_sleep_log,
+)
+import torch
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
 # Import config loading function and config object
 from .config import config, load_config
+from .rate_limiter import TokenBucket, estimate_tokens
 
 # --- Logging Setup ---
 # Configure a root logger or a specific logger for the app
@@ -29,6 +38,48 @@ logger = logging.getLogger("aicoscientist") # Use a specific name for the app lo
 # logger.addHandler(file_handler)
 
 # --- LLM Interaction ---
+# Shared proactive throttles for every call_llm invocation (disabled unless configured)
+_request_bucket = TokenBucket(config["rpm"]) if config.get("rpm") else None
+_token_bucket = TokenBucket(config["tpm"]) if config.get("tpm") else None
+
+class EmptyLLMResponseError(Exception):
+    """Raised when the LLM returns a completion without any choices."""
+
+# Transient failures worth retrying; anything else (e.g. 400/401) fails fast
+_RETRYABLE_LLM_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+    EmptyLLMResponseError,
+)
+
+@retry(stop=stop_after_attempt(config.get("max_retries", 3)),
+       wait=wait_random_exponential(multiplier=config.get("initial_retry_delay", 1),
+                                   min=config.get("initial_retry_delay", 1), max=60),
+       retry=retry_if_exception_type(_RETRYABLE_LLM_ERRORS),
+       before_sleep=before_sleep_log(logger, logging.WARNING),
+       reraise=True)
+def _create_completion(client: OpenAI, llm_model: str, prompt: str, temperature: float) -> str:
+    """Issues a single chat completion request (retried by tenacity on transient errors)."""
+    estimated_tokens = estimate_tokens(prompt)
+    if _request_bucket:
+        _request_bucket.acquire(1)
+    if _token_bucket:
+        _token_bucket.acquire(estimated_tokens)
+    completion = client.chat.completions.create(
+        model=llm_model,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=temperature,
+    )
+    usage = getattr(completion, "usage", None)
+    if _token_bucket and usage and usage.total_tokens:
+        _token_bucket.reconcile(usage.total_tokens - estimated_tokens)
+    if not completion.choices:
+        logger.error("No choices in the LLM response: %s", completion)
+        raise EmptyLLMResponseError(f"No choices in the response: {completion}")
+    return completion.choices[0].message.content or "" # Return empty string if content is None
+
 def call_llm(prompt: str, temperature: float = 0.7) -> str:
     """
     Calls an LLM via the OpenRouter API and returns the response. Handles retries.
@@ -38,8 +89,6 @@ def call_llm(prompt: str, temperature: float = 0.7) -> str:
         api_key=os.getenv("OPENROUTER_API_KEY"),
     )
     llm_model = config.get("llm_model")
-    max_retries = config.get("max_retries", 3)
-    initial_delay = config.get("initial_retry_delay", 1)
 
     if not llm_model:
         logger.error("LLM model not configured in config.yaml")
@@ -48,47 +97,24 @@ def call_llm(prompt: str, temperature: float = 0.7) -> str:
         logger.error("OPENROUTER_API_KEY environment variable not set.")
         return "Error: OpenRouter API key not set."
 
-    last_error_message = "API call failed after multiple retries." # Default error
-
-    for attempt in range(max_retries):
-        try:
-            completion = client.chat.completions.create(
-                model=llm_model,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=temperature,
-            )
-            if completion.choices and len(completion.choices) > 0:
-                return completion.choices[0].message.content or "" # Return empty string if content is None
-            else:
-                logger.error("No choices in the LLM response: %s", completion)
-                last_error_message = f"No choices in the response: {completion}"
-                # Continue to retry if possible
-
-        except Exception as e:
-            error_str = str(e)
-            if "401" in error_str or "No auth credentials found" in error_str:
-                logger.error(f"Authentication failed (401 Unauthorized): {e}")
-                return (
-                    "Authentication with OpenRouter failed (401 Unauthorized). "
-                    "Please check that your OPENROUTER_API_KEY environment variable is set and valid "
-                    "in the environment where the server is running. No hypotheses can be generated until this is resolved."
-                )
-            if "Rate limit exceeded" in error_str:
-                logger.warning(f"Rate limit exceeded (attempt {attempt + 1}/{max_retries}): {e}")
-                last_error_message = f"Rate limit exceeded: {e}"
-            else:
-                logger.error(f"API call failed (attempt {attempt + 1}/{max_retries}): {e}")
-                last_error_message = f"API call failed: {e}"
-
-            if attempt < max_retries - 1:
-                wait_time = initial_delay * (2 ** attempt)
-                logger.info(f"Retrying in {wait_time} seconds...")
-                time.sleep(wait_time)
-            else:
-                logger.error("Max retries reached. Giving up.")
-                break # Exit loop after last attempt
-
-    return f"Error: {last_error_message}" # Return the last recorded error
+    try:
+        return _create_completion(client, llm_model, prompt, temperature)
+    except openai.AuthenticationError as e:
+        logger.error(f"Authentication failed (401 Unauthorized): {e}")
+        return (
+            "Authentication with OpenRouter failed (401 Unauthorized). "
+            "Please check that your OPENROUTER_API_KEY environment variable is set and valid "
+            "in the environment where the server is running. No hypotheses can be generated until this is resolved."
+        )
+    except openai.RateLimitError as e:
+        logger.error(f"Rate limit exceeded, giving up: {e}")
+        return f"Error: Rate limit exceeded: {e}"
+    except EmptyLLMResponseError as e:
+        logger.error("Max retries reached. Giving up.")
+        return f"Error: {e}"
+    except Exception as e:
+        logger.error(f"API call failed: {e}")
+        return f"Error: API call failed: {e}"
 
 
 # --- Environment Detection ---
@@ -137,9 +163,11 @@ def filter_free_models(all_models: List[str]) -> List[str]:
     return [model for model in all_models if ":free" in model]
 
 # --- ID Generation ---
+_id_counter = itertools.count(1)
+
 def generate_unique_id(prefix="H") -> str:
-    """Generates a unique identifier string."""
-    return f"{prefix}{random.randint(1000, 9999)}"
+    """Generates a unique identifier string (process-wide counter plus a random suffix)."""
+    return f"{prefix}{next(_id_counter):06d}-{uuid.uuid4().hex[:6]}"
 
 
 # --- VIS.JS Graph Data Generation ---
@@ -177,15 +205,21 @@ def generate_visjs_data(adjacency_graph: Dict) -> Dict[str, list]:
 
 # --- Similarity Calculation ---
 _sentence_transformer_model = None
+_max_encode_chars = None  # ~4 chars per token x model.max_seq_length; longer input is truncated anyway
 
 def get_sentence_transformer_model():
     """Loads and returns a singleton instance of the sentence transformer model."""
-    global _sentence_transformer_model
+    global _sentence_transformer_model, _max_encode_chars
     if _sentence_transformer_model is None:
         model_name = config.get('sentence_transformer_model', 'all-MiniLM-L6-v2')
         try:
             logger.info(f"Loading sentence transformer model: {model_name}...")
             _sentence_transformer_model = SentenceTransformer(model_name)
+            if torch.cuda.is_available():
+                # FP16 inference halves memory traffic; dot products are upcast to FP32 below
+                _sentence_transformer_model = _sentence_transformer_model.half().to('cuda')
+            max_seq_length = getattr(_sentence_transformer_model, 'max_seq_length', None)
+            _max_encode_chars = 4 * max_seq_length if max_seq_length else None
             logger.info("Sentence transformer model loaded successfully.")
         except ImportError:
             logger.error("Failed to import sentence_transformers. Please install it: pip install sentence-transformers")
@@ -195,23 +229,40 @@ def get_sentence_transformer_model():
             raise # Re-raise after logging
     return _sentence_transformer_model
 
+def _token_set(text: str) -> frozenset:
+    """Lower-cased whitespace token set used by the lexical prefilter."""
+    return frozenset(text.lower().split())
+
+def _token_jaccard(tokens_a: frozenset, tokens_b: frozenset) -> float:
+    """Jaccard overlap of two token sets."""
+    return len(tokens_a & tokens_b) / max(1, len(tokens_a | tokens_b))
+
 def similarity_score(textA: str, textB: str) -> float:
-    """Calculates cosine similarity between two texts using sentence embeddings."""
+    """Calculates cosine similarity between two texts using sentence embeddings.
+
+    Pairs whose token-set Jaccard overlap falls below ``cheap_prefilter`` are
+    treated as unrelated and scored 0.0 without running the transformer.
+    """
     try:
         if not textA or not textB:
             logger.warning("Empty string provided to similarity_score.")
             return 0.0
 
+        if _token_jaccard(_token_set(textA), _token_set(textB)) < config.get('cheap_prefilter', 0.02):
+            return 0.0
+
         model = get_sentence_transformer_model()
         if model is None: # Check if model loading failed previously
              return 0.0 # Or handle error appropriately
 
-        embedding_a = model.encode(textA, convert_to_tensor=True)
-        embedding_b = model.encode(textB, convert_to_tensor=True)
+        # Skip tokenizing the tail the model would discard
+        embedding_a = model.encode(textA[:_max_encode_chars], convert_to_tensor=True)
+        embedding_b = model.encode(textB[:_max_encode_chars], convert_to_tensor=True)
 
         # Ensure embeddings are 2D numpy arrays for cosine_similarity
-        embedding_a_np = embedding_a.cpu().numpy().reshape(1, -1)
-        embedding_b_np = embedding_b.cpu().numpy().reshape(1, -1)
+        # (upcast to float32 so FP16 embeddings accumulate at full precision)
+        embedding_a_np = embedding_a.cpu().numpy().reshape(1, -1).astype(np.float32)
+        embedding_b_np = embedding_b.cpu().numpy().reshape(1, -1).astype(np.float32)
 
         similarity = cosine_similarity(embedding_a_np, embedding_b_np)[0][0]
 
@@ -223,3 +274,43 @@ def similarity_score(textA: str, textB: str) -> float:
     except Exception as e:
         logger.error(f"Error calculating similarity score: {e}", exc_info=True) # Log traceback
         return 0.0 # Return 0 on error instead of 0.5
+
+def similarity_matrix(texts: List[str]) -> np.ndarray:
+    """
+    Calculates pairwise similarity for a list of texts in one batched encode.
+
+    Returns an (n, n) array where entry [i, j] matches similarity_score(texts[i], texts[j]).
+    Pairs rejected by the lexical prefilter (or involving an empty text) are 0.0, and only
+    texts that take part in at least one surviving pair are sent to the transformer.
+    The diagonal is left at 0.0.
+    """
+    n = len(texts)
+    result = np.zeros((n, n), dtype=np.float32)
+    try:
+        threshold = config.get('cheap_prefilter', 0.02)
+        token_sets = [_token_set(t) if t else None for t in texts]
+        keep = np.zeros((n, n), dtype=bool)
+        for i in range(n):
+            if token_sets[i] is None:
+                continue
+            for j in range(i + 1, n):
+                if token_sets[j] is not None and _token_jaccard(token_sets[i], token_sets[j]) >= threshold:
+                    keep[i, j] = keep[j, i] = True
+
+        rows = np.flatnonzero(keep.any(axis=1))
+        if len(rows) == 0:
+            return result
+
+        model = get_sentence_transformer_model()
+        if model is None:
+            return result
+
+        embeddings = model.encode([texts[i][:_max_encode_chars] for i in rows],
+                                  batch_size=1024, convert_to_numpy=True)
+        similarities = np.clip(cosine_similarity(embeddings.astype(np.float32)), 0.0, 1.0)
+        block = np.ix_(rows, rows)
+        result[block] = np.where(keep[block], similarities, 0.0)
+        return result
+    except Exception as e:
+        logger.error(f"Error calculating similarity matrix: {e}", exc_info=True)
+        return np.zeros((n, n), dtype=np.float32)
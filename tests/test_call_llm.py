@@ -0,0 +1,80 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+import httpx
+import openai
+
+from app import utils
+
+
+def _status_error(error_class, status_code):
+    """Builds an openai status error the way the client raises it."""
+    request = httpx.Request("POST", "https://test.api/chat/completions")
+    response = httpx.Response(status_code, request=request)
+    return error_class(f"Error code: {status_code}", response=response, body=None)
+
+
+class TestCallLLMRetries(unittest.TestCase):
+
+    def setUp(self):
+        # Skip tenacity's backoff sleeps between attempts
+        sleep_patcher = patch.object(utils._create_completion.retry, "sleep", lambda seconds: None)
+        sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
+        env_patcher = patch.dict("os.environ", {"OPENROUTER_API_KEY": "test-key"})
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+
+        self.mock_client = MagicMock()
+        self.mock_client.api_key = "test-key"
+        openai_patcher = patch("app.utils.OpenAI", return_value=self.mock_client)
+        openai_patcher.start()
+        self.addCleanup(openai_patcher.stop)
+
+        self.create = self.mock_client.chat.completions.create
+
+    def test_success_returns_content(self):
+        """
+        Test that a successful completion returns the message content after one call.
+        """
+        completion = MagicMock()
+        completion.choices = [MagicMock()]
+        completion.choices[0].message.content = "Test response"
+        self.create.return_value = completion
+
+        self.assertEqual(utils.call_llm("prompt"), "Test response")
+        self.assertEqual(self.create.call_count, 1)
+
+    def test_authentication_error_is_not_retried(self):
+        """
+        Test that an AuthenticationError returns the auth message after a single call.
+        """
+        self.create.side_effect = _status_error(openai.AuthenticationError, 401)
+
+        result = utils.call_llm("prompt")
+        self.assertTrue(result.startswith("Authentication with OpenRouter failed"))
+        self.assertEqual(self.create.call_count, 1)
+
+    def test_rate_limit_error_is_retried(self):
+        """
+        Test that a RateLimitError is retried up to max_retries and then reported.
+        """
+        self.create.side_effect = _status_error(openai.RateLimitError, 429)
+
+        result = utils.call_llm("prompt")
+        self.assertTrue(result.startswith("Error: Rate limit exceeded"))
+        self.assertEqual(self.create.call_count, utils.config.get("max_retries", 3))
+
+    def test_bad_request_error_is_not_retried(self):
+        """
+        Test that a BadRequestError fails fast with a generic API error.
+        """
+        self.create.side_effect = _status_error(openai.BadRequestError, 400)
+
+        result = utils.call_llm("prompt")
+        self.assertTrue(result.startswith("Error: API call failed"))
+        self.assertEqual(self.create.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
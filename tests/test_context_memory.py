@@ -0,0 +1,93 @@
+import unittest
+
+from app.models import Hypothesis, ContextMemory
+
+
+def _make_hypothesis(hypothesis_id, elo_score=1200.0, is_active=True):
+    h = Hypothesis(hypothesis_id, f"Title {hypothesis_id}", f"Text {hypothesis_id}")
+    h.elo_score = elo_score
+    h.is_active = is_active
+    return h
+
+
+class TestContextMemory(unittest.TestCase):
+
+    def test_add_hypothesis_grows_past_initial_capacity(self):
+        """
+        Test that adding more hypotheses than the initial capacity keeps every row intact.
+        """
+        context = ContextMemory()
+        count = ContextMemory._INITIAL_CAPACITY * 2 + 5
+        for i in range(count):
+            context.add_hypothesis(_make_hypothesis(f"G{i}", elo_score=1000.0 + i))
+
+        self.assertGreaterEqual(len(context.elo), count)
+        self.assertEqual(len(context.get_active_hypotheses()), count)
+        for i in range(count):
+            row = context.id_to_row[f"G{i}"]
+            self.assertEqual(context.elo[row], 1000.0 + i)
+            self.assertTrue(context.active[row])
+
+    def test_re_adding_hypothesis_reuses_row(self):
+        """
+        Test that re-adding an existing hypothesis ID updates its row instead of appending.
+        """
+        context = ContextMemory()
+        context.add_hypothesis(_make_hypothesis("G1"))
+        context.add_hypothesis(_make_hypothesis("G1", elo_score=1300.0))
+        self.assertEqual(len(context.id_to_row), 1)
+        self.assertEqual(context.elo[context.id_to_row["G1"]], 1300.0)
+
+    def test_update_elo_and_set_active_stay_in_sync(self):
+        """
+        Test that update_elo and set_active write both the object and the index.
+        """
+        context = ContextMemory()
+        context.add_hypothesis(_make_hypothesis("G1"))
+        context.add_hypothesis(_make_hypothesis("G2"))
+
+        context.update_elo("G1", 1234.5)
+        context.set_active("G2", False)
+
+        self.assertEqual(context.hypotheses["G1"].elo_score, 1234.5)
+        self.assertEqual(context.elo[context.id_to_row["G1"]], 1234.5)
+        self.assertFalse(context.hypotheses["G2"].is_active)
+        self.assertFalse(context.active[context.id_to_row["G2"]])
+        self.assertEqual([h.hypothesis_id for h in context.get_active_hypotheses()], ["G1"])
+
+        # Unknown IDs are ignored
+        context.update_elo("missing", 1.0)
+        context.set_active("missing", False)
+
+    def test_top_k_by_elo_matches_sorted(self):
+        """
+        Test that top_k_by_elo matches sorted(..., reverse=True), including insertion order for ties.
+        """
+        context = ContextMemory()
+        scores = [1200.0, 1216.0, 1200.0, 1184.0, 1216.0, 1200.0, 1200.00001, 1200.00002]
+        for i, score in enumerate(scores):
+            context.add_hypothesis(_make_hypothesis(f"G{i}", elo_score=score))
+        context.set_active("G4", False)
+
+        active = context.get_active_hypotheses()
+        for k in range(1, len(scores) + 2):
+            expected = sorted(active, key=lambda h: h.elo_score, reverse=True)[:k]
+            self.assertEqual(
+                [h.hypothesis_id for h in context.top_k_by_elo(k)],
+                [h.hypothesis_id for h in expected],
+            )
+
+    def test_top_k_by_elo_includes_inactive_when_requested(self):
+        """
+        Test that active_only=False ranks inactive hypotheses too.
+        """
+        context = ContextMemory()
+        context.add_hypothesis(_make_hypothesis("G1", elo_score=1300.0, is_active=False))
+        context.add_hypothesis(_make_hypothesis("G2", elo_score=1200.0))
+
+        self.assertEqual([h.hypothesis_id for h in context.top_k_by_elo(2)], ["G2"])
+        self.assertEqual([h.hypothesis_id for h in context.top_k_by_elo(2, active_only=False)], ["G1", "G2"])
+        self.assertEqual(context.top_k_by_elo(0), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import time
+import unittest
+
+from app.rate_limiter import TokenBucket, estimate_tokens
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_acquire_within_capacity_does_not_block(self):
+        """
+        Test that acquiring up to the bucket capacity returns immediately.
+        """
+        bucket = TokenBucket(rate_per_min=60, capacity=5)
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        self.assertLess(time.monotonic() - start, 0.05)
+
+    def test_acquire_beyond_capacity_waits_for_refill(self):
+        """
+        Test that an empty bucket blocks until enough tokens have been refilled.
+        """
+        bucket = TokenBucket(rate_per_min=1200, capacity=1)  # 20 tokens/s
+        bucket.acquire()
+        start = time.monotonic()
+        bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.04)
+
+    def test_reconcile_positive_delta_creates_debt(self):
+        """
+        Test that under-estimated usage makes the next acquire wait.
+        """
+        bucket = TokenBucket(rate_per_min=1200, capacity=2)
+        bucket.acquire(1)
+        bucket.reconcile(2)
+        start = time.monotonic()
+        bucket.acquire(1)
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_invalid_rate(self):
+        """
+        Test that a non-positive rate is rejected.
+        """
+        with self.assertRaises(ValueError):
+            TokenBucket(rate_per_min=0)
+
+    def test_estimate_tokens(self):
+        """
+        Test the ~4 characters per token estimate.
+        """
+        self.assertEqual(estimate_tokens(""), 1)
+        self.assertEqual(estimate_tokens("a" * 400), 101)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+import numpy as np
+
+from app import utils
+
+# Texts A and B share most words; C shares none with either
+TEXT_A = "solar panel efficiency with perovskite coatings"
+TEXT_B = "perovskite coatings for solar panel efficiency"
+TEXT_C = "quantum error correction codes"
+
+# Fixed embeddings per text so the expected cosine values are known
+_EMBEDDINGS = {
+    TEXT_A: np.array([1.0, 0.0, 0.0], dtype=np.float32),
+    TEXT_B: np.array([0.6, 0.8, 0.0], dtype=np.float32),
+    TEXT_C: np.array([0.0, 0.0, 1.0], dtype=np.float32),
+}
+
+
+def _fake_encode(texts, **kwargs):
+    return np.stack([_EMBEDDINGS[t] for t in texts])
+
+
+class TestSimilarityPrefilter(unittest.TestCase):
+
+    def setUp(self):
+        self.model = MagicMock()
+        self.model.encode.side_effect = _fake_encode
+        patcher = patch("app.utils.get_sentence_transformer_model", return_value=self.model)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_similarity_score_skips_encode_below_prefilter(self):
+        """
+        Test that lexically unrelated texts score 0.0 without running the model.
+        """
+        self.assertEqual(utils.similarity_score(TEXT_A, TEXT_C), 0.0)
+        self.model.encode.assert_not_called()
+
+    def test_similarity_matrix_symmetric_with_zero_diagonal(self):
+        """
+        Test that similarity_matrix is symmetric, has a 0.0 diagonal and zeroes prefiltered pairs.
+        """
+        matrix = utils.similarity_matrix([TEXT_A, TEXT_B, TEXT_C])
+
+        self.assertEqual(matrix.shape, (3, 3))
+        np.testing.assert_allclose(matrix, matrix.T)
+        np.testing.assert_array_equal(np.diag(matrix), np.zeros(3))
+        self.assertAlmostEqual(float(matrix[0, 1]), 0.6, places=5)
+        self.assertEqual(float(matrix[0, 2]), 0.0)
+        self.assertEqual(float(matrix[1, 2]), 0.0)
+
+        # Only texts that take part in a surviving pair are encoded
+        self.model.encode.assert_called_once()
+        self.assertEqual(self.model.encode.call_args.args[0], [TEXT_A, TEXT_B])
+
+    def test_similarity_matrix_all_pairs_filtered(self):
+        """
+        Test that the model is never called when every pair is below the prefilter.
+        """
+        matrix = utils.similarity_matrix([TEXT_A, TEXT_C, ""])
+        np.testing.assert_array_equal(matrix, np.zeros((3, 3)))
+        self.model.encode.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()